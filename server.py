@@ -3,22 +3,99 @@
 
 import json
 import asyncio
+import heapq
 import logging
+import math
+import random
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+from operator import itemgetter
 from typing import Any
 import httpx
+import ijson
+import orjson
 from mcp.server import Server
 from mcp.types import Tool, TextContent
 
-logging.basicConfig(level=logging.INFO)
+logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s %(message)s")
 logger = logging.getLogger("restaurant-mcp-server")
 
 # Initialize MCP server
 server = Server("restaurant-finder")
 
+# Mean Earth radius used for distance calculations
+EARTH_RADIUS_M = 6371000
+
 # Nominatim API for geocoding
 NOMINATIM_BASE_URL = "https://nominatim.openstreetmap.org"
 # Overpass API for finding restaurants
 OVERPASS_BASE_URL = "https://overpass-api.de/api/interpreter"
+# Restaurants, cafes, pubs, and fast food within a circle; filled with (radius, lat, lon)
+OVERPASS_QUERY_TEMPLATE = b"""[out:json][timeout:30];
+nwr["amenity"~"^(restaurant|cafe|pub|fast_food)$"](around:%d,%f,%f);
+out center;"""
+
+# Shared HTTP client so connections to Nominatim/Overpass are kept alive
+_http_client: httpx.AsyncClient | None = None
+
+# Retry policy for transient upstream failures
+MAX_ATTEMPTS = 5
+MAX_BACKOFF = 30.0  # seconds
+RETRY_STATUS_CODES = {429, 502, 503, 504}
+
+# Response bodies larger than this are parsed in a worker thread
+LARGE_RESPONSE_BYTES = 256 * 1024
+
+# Geocoding cache: normalized address -> (timestamp, location)
+GEOCODE_CACHE_MAX = 1024
+GEOCODE_CACHE_TTL = 86400  # seconds before a cached location is refreshed
+GEOCODE_CACHE_MAX_AGE = 30 * 86400  # seconds a stale location may still be served
+_geocode_cache: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+_geocode_fetches: dict[str, asyncio.Task] = {}
+_geocode_refreshes: dict[str, asyncio.Task] = {}
+
+# Display labels for the OSM amenity types we search for
+AMENITY_LABELS = {
+    "restaurant": "Restaurant",
+    "cafe": "Café",
+    "pub": "Pub",
+    "fast_food": "Fast Food"
+}
+
+# Element types whose position comes from the "center" added by `out center`
+_WAY_OR_RELATION = frozenset(("way", "relation"))
+
+# (latitude in radians, longitude in radians, cos(latitude)) for distance calculations
+TrigPoint = tuple[float, float, float]
+
+
+@dataclass(frozen=True, slots=True)
+class Restaurant:
+    """A place parsed from Overpass; cached instances are shared, so they are immutable."""
+    id: int
+    type: str
+    name: str
+    latitude: float
+    longitude: float
+    amenity: str
+    cuisine: str
+    phone: str
+    website: str
+    opening_hours: str
+    point: TrigPoint = field(repr=False, compare=False)
+    # Lower-cased name and cuisine, matched by search queries
+    search_text: str = field(repr=False, compare=False)
+    distance_m: int | None = None
+
+
+# Overpass cache: (lat, lon) rounded to ~11 m plus radius -> (timestamp, places)
+AREA_CACHE_MAX = 256
+AREA_CACHE_TTL = 900  # seconds
+_area_cache: OrderedDict[tuple[float, float, int], tuple[float, list[Restaurant]]] = OrderedDict()
+_area_fetches: dict[tuple[float, float, int], asyncio.Task] = {}
 
 # Tool definitions
 TOOLS = [
@@ -104,7 +181,7 @@ TOOLS = [
             "properties": {
                 "query": {
                     "type": "string",
-                    "description": "Cuisine type or keyword (e.g., 'italian', 'pizza', 'indian')"
+                    "description": "Cuisine type or keyword (e.g., 'italian', 'pizza', 'indian'); separate alternatives with '|' (e.g., 'italian|pizza')"
                 },
                 "address": {
                     "type": "string",
@@ -127,131 +204,403 @@ TOOLS = [
 ]
 
 
+class RequestLimiter:
+    """Caps concurrent requests to a service and spaces out when they start."""
+    
+    def __init__(self, max_concurrent: int, min_interval: float = 0.0):
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._min_interval = min_interval
+        self._lock = asyncio.Lock()
+        self._next_start = 0.0
+    
+    async def __aenter__(self) -> None:
+        await self._semaphore.acquire()
+        try:
+            async with self._lock:
+                delay = self._next_start - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                self._next_start = time.monotonic() + self._min_interval
+        except BaseException:
+            self._semaphore.release()
+            raise
+    
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self._semaphore.release()
+
+
+# Nominatim's usage policy allows at most one request per second
+NOMINATIM_LIMITER = RequestLimiter(max_concurrent=2, min_interval=1.0)
+OVERPASS_LIMITER = RequestLimiter(max_concurrent=4, min_interval=0.5)
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared HTTP client, creating it on first use."""
+    global _http_client
+    if _http_client is None:
+        # Idle connections are kept for a minute rather than httpx's default 5 s, so
+        # sporadic tool calls reuse them instead of redoing DNS, TCP and TLS setup.
+        # Retries are left to _request, which backs off between attempts.
+        transport = httpx.AsyncHTTPTransport(
+            http2=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=60.0),
+            retries=0
+        )
+        _http_client = httpx.AsyncClient(
+            transport=transport,
+            timeout=httpx.Timeout(40.0, connect=5.0),
+            # Overpass and Nominatim JSON compresses well; httpx decodes it transparently (brotli via httpx[brotli])
+            headers={"User-Agent": "mcp-restaurant-finder", "Accept-Encoding": "gzip, br, deflate"}
+        )
+    return _http_client
+
+
+async def _request(
+    limiter: RequestLimiter,
+    method: str,
+    url: str,
+    stream: bool = False,
+    **kwargs: Any
+) -> httpx.Response:
+    """Send a rate-limited request, retrying throttling and network errors with exponential backoff.
+    
+    With stream=True the body is left unread and the caller must close the response.
+    """
+    client = get_http_client()
+    request = client.build_request(method, url, **kwargs)
+    attempt = 0
+    while True:
+        try:
+            async with limiter:
+                response = await client.send(request, stream=stream)
+            try:
+                response.raise_for_status()
+            except httpx.HTTPStatusError:
+                await response.aclose()
+                raise
+            logger.debug(
+                "%s %s -> %s, content-encoding=%s",
+                method, url, response.status_code, response.headers.get("content-encoding", "identity")
+            )
+            return response
+        except (httpx.HTTPStatusError, httpx.TransportError) as e:
+            attempt += 1
+            retryable = (
+                isinstance(e, httpx.TransportError)
+                or e.response.status_code in RETRY_STATUS_CODES
+            )
+            if not retryable or attempt >= MAX_ATTEMPTS:
+                raise
+            wait = min(MAX_BACKOFF, 2 ** (attempt - 1) + random.random())
+            logger.warning("Attempt %d failed: %s, retrying in %.1fs...", attempt, e, wait)
+            await asyncio.sleep(wait)
+
+
+async def _parse_json(response: httpx.Response) -> Any:
+    """Parse a JSON response body, off the event loop when it is large."""
+    raw = response.content
+    if len(raw) > LARGE_RESPONSE_BYTES:
+        return await asyncio.to_thread(orjson.loads, raw)
+    return orjson.loads(raw)
+
+
+def _cache_get(cache: OrderedDict, key: Any, ttl: float) -> Any:
+    """Return a fresh cached value and mark it recently used, or None."""
+    entry = cache.get(key)
+    if entry is None:
+        return None
+    timestamp, value = entry
+    if time.time() - timestamp >= ttl:
+        del cache[key]
+        return None
+    cache.move_to_end(key)
+    return value
+
+
+def _cache_put(cache: OrderedDict, key: Any, value: Any, max_size: int) -> None:
+    """Store a value, evicting the least recently used entry when full."""
+    cache[key] = (time.time(), value)
+    cache.move_to_end(key)
+    if len(cache) > max_size:
+        cache.popitem(last=False)
+
+
 async def geocode_address(address: str) -> dict[str, Any]:
-    """Convert address to coordinates using Nominatim."""
+    """Convert address to coordinates using Nominatim, caching successful lookups.
+    
+    Locations older than GEOCODE_CACHE_TTL are still returned immediately while a
+    background task refreshes them, so only never-seen addresses wait on Nominatim.
+    """
+    if not address:
+        return {}
+    key = " ".join(address.lower().split())
+    location = _cache_get(_geocode_cache, key, GEOCODE_CACHE_MAX_AGE)
+    if location is not None:
+        # Serve a stale location right away and refresh it in the background
+        timestamp = _geocode_cache[key][0]
+        if time.time() - timestamp >= GEOCODE_CACHE_TTL and key not in _geocode_refreshes:
+            _geocode_refreshes[key] = asyncio.create_task(_refresh_geocode(key, address))
+        return location
+    
+    # Only one request per address goes to Nominatim; concurrent callers share its outcome, failures included
+    if key not in _geocode_fetches:
+        _geocode_fetches[key] = asyncio.create_task(_load_geocode(key, address))
+    return await asyncio.shield(_geocode_fetches[key])
+
+
+async def _load_geocode(key: str, address: str) -> dict[str, Any]:
+    """Fetch an address for the first time and cache it if found."""
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{NOMINATIM_BASE_URL}/search",
-                params={
-                    "q": address,
-                    "format": "json",
-                    "limit": 1
-                },
-                timeout=10.0,
-                headers={"User-Agent": "mcp-restaurant-finder"}
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            if data:
-                result = data[0]
-                return {
-                    "latitude": float(result["lat"]),
-                    "longitude": float(result["lon"]),
-                    "display_name": result.get("display_name", "")
-                }
-            return {}
+        location = await _fetch_geocode(address)
+        if location:
+            _cache_put(_geocode_cache, key, location, GEOCODE_CACHE_MAX)
+        return location
+    finally:
+        del _geocode_fetches[key]
+
+
+async def _refresh_geocode(key: str, address: str) -> None:
+    """Re-fetch a cached address, keeping the old location if the lookup fails."""
+    try:
+        location = await _fetch_geocode(address)
+        if location:
+            _cache_put(_geocode_cache, key, location, GEOCODE_CACHE_MAX)
+    finally:
+        del _geocode_refreshes[key]
+
+
+async def reverse_geocode(latitude: float, longitude: float) -> dict[str, Any]:
+    """Look up the address of a point using Nominatim."""
+    response = await _request(
+        NOMINATIM_LIMITER,
+        "GET",
+        f"{NOMINATIM_BASE_URL}/reverse",
+        params={
+            "format": "json",
+            "lat": latitude,
+            "lon": longitude,
+            "zoom": 18,
+            "addressdetails": 1
+        },
+        timeout=10.0
+    )
+    return await _parse_json(response)
+
+
+async def _fetch_geocode(address: str) -> dict[str, Any]:
+    """Look up an address with Nominatim."""
+    try:
+        response = await _request(
+            NOMINATIM_LIMITER,
+            "GET",
+            f"{NOMINATIM_BASE_URL}/search",
+            params={
+                "q": address,
+                "format": "json",
+                "limit": 1
+            },
+            timeout=10.0
+        )
+        data = await _parse_json(response)
+        
+        if data:
+            result = data[0]
+            return {
+                "latitude": float(result["lat"]),
+                "longitude": float(result["lon"]),
+                "display_name": result.get("display_name", "")
+            }
+        return {}
     except Exception as e:
-        logger.error(f"Geocoding error: {e}")
+        logger.error("Geocoding error: %s", e)
         return {}
 
 
-async def find_restaurants(latitude: float, longitude: float, radius: int = 1000, limit: int = 10) -> list[dict[str, Any]]:
-    """Find restaurants using Overpass API with fallback amenities."""
-    import math
+async def find_restaurants(
+    latitude: float,
+    longitude: float,
+    radius: int = 1000,
+    limit: int = 10,
+    query: str | None = None
+) -> list[Restaurant]:
+    """Find restaurants within `radius` meters of a point, nearest first.
     
+    If `query` is given, only places whose name or cuisine contains it are returned;
+    "|" separates alternative keywords.
+    """
+    places = await _fetch_area(latitude, longitude, radius)
+    
+    # Ways matched by `around` can have their center outside the circle, and cached
+    # areas are centered up to a few meters away, so re-check every distance
+    origin = _trig_point(latitude, longitude)
+    pattern = _query_pattern(query) if query else None
+    nearby = []
+    for place in places:
+        if pattern and not pattern.search(place.search_text):
+            continue
+        distance = _haversine_m(origin, place.point)
+        if distance <= radius:
+            nearby.append((distance, place))
+    
+    # Partial sort: only the nearest `limit` places are ordered and copied with their distance
+    restaurants = [
+        replace(place, distance_m=round(distance))
+        for distance, place in heapq.nsmallest(limit, nearby, key=itemgetter(0))
+    ]
+    logger.info("Found %d places from Overpass API", len(restaurants))
+    return restaurants
+
+
+@lru_cache(maxsize=256)
+def _query_pattern(query: str) -> re.Pattern | None:
+    """Compile a substring matcher for "|"-separated keywords against Restaurant.search_text.
+
+    Returns None if the query has no non-empty keyword, so it filters nothing.
+    """
+    terms = [re.escape(term) for term in (t.strip() for t in query.lower().split("|")) if term]
+    return re.compile("|".join(terms)) if terms else None
+
+
+def _trig_point(latitude: float, longitude: float) -> TrigPoint:
+    """Precompute the terms used by _haversine_m: (lat rad, lon rad, cos lat)."""
+    lat = math.radians(latitude)
+    return lat, math.radians(longitude), math.cos(lat)
+
+
+def _haversine_m(p1: TrigPoint, p2: TrigPoint) -> float:
+    """Great-circle distance in meters between two precomputed points."""
+    lat1, lon1, cos_lat1 = p1
+    lat2, lon2, cos_lat2 = p2
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + cos_lat1 * cos_lat2 * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
+
+
+def _cached_area(key: tuple[float, float, int]) -> list[Restaurant] | None:
+    """Return cached places for an area, or for a larger radius around the same point.
+    
+    Callers filter by distance, so a wider cached area serves smaller radii as well.
+    """
+    places = _cache_get(_area_cache, key, AREA_CACHE_TTL)
+    if places is not None:
+        return places
+    latitude, longitude, radius = key
+    for cached_key in list(_area_cache):
+        if cached_key[:2] == (latitude, longitude) and cached_key[2] > radius:
+            places = _cache_get(_area_cache, cached_key, AREA_CACHE_TTL)
+            if places is not None:
+                return places
+    return None
+
+
+async def _fetch_area(latitude: float, longitude: float, radius: int) -> list[Restaurant]:
+    """Return all places around a point, reusing cached Overpass results for the area."""
+    key = (round(latitude, 4), round(longitude, 4), radius)
+    places = _cached_area(key)
+    if places is not None:
+        return places
+    
+    # Only one Overpass query per area; concurrent callers share its outcome, failures included
+    if key not in _area_fetches:
+        _area_fetches[key] = asyncio.create_task(_load_area(key, latitude, longitude, radius))
+    return await asyncio.shield(_area_fetches[key])
+
+
+async def _load_area(key: tuple[float, float, int], latitude: float, longitude: float, radius: int) -> list[Restaurant]:
+    """Query Overpass for an area and cache the places if the request succeeded."""
     try:
-        # Convert radius from meters to approximate degrees
-        lat_radius = radius / 111000
-        lon_radius = radius / (111000 * abs(math.cos(math.radians(latitude))))
-        
-        bbox = f"{latitude - lat_radius},{longitude - lon_radius},{latitude + lat_radius},{longitude + lon_radius}"
-        
-        # Extended query to include restaurants, cafes, pubs, and fast food
-        overpass_query = f"""[out:json][timeout:30];
-(
-  node["amenity"="restaurant"]({bbox});
-  way["amenity"="restaurant"]({bbox});
-  relation["amenity"="restaurant"]({bbox});
-  node["amenity"="cafe"]({bbox});
-  way["amenity"="cafe"]({bbox});
-  node["amenity"="pub"]({bbox});
-  way["amenity"="pub"]({bbox});
-  node["amenity"="fast_food"]({bbox});
-  way["amenity"="fast_food"]({bbox});
-);
-out center;"""
-        
-        async with httpx.AsyncClient(timeout=40.0) as client:
-            for attempt in range(2):
-                try:
-                    response = await client.post(
-                        OVERPASS_BASE_URL,
-                        data=overpass_query,
-                        timeout=40.0,
-                        headers={"User-Agent": "mcp-restaurant-finder"}
-                    )
-                    response.raise_for_status()
-                    data = response.json()
-                    break
-                except Exception as e:
-                    if attempt == 0:
-                        logger.warning(f"Attempt {attempt + 1} failed: {e}, retrying...")
-                        await asyncio.sleep(2)
-                    else:
-                        logger.error(f"Final attempt failed: {e}")
-                        return []
+        places = await _fetch_overpass(latitude, longitude, radius)
+        if places is not None:
+            _cache_put(_area_cache, key, places, AREA_CACHE_MAX)
+        return places or []
+    finally:
+        del _area_fetches[key]
+
+
+async def _fetch_overpass(latitude: float, longitude: float, radius: int) -> list[Restaurant] | None:
+    """Query Overpass for restaurants with fallback amenities; None if the request failed."""
+    try:
+        overpass_query = OVERPASS_QUERY_TEMPLATE % (radius, latitude, longitude)
+        try:
+            response = await _request(
+                OVERPASS_LIMITER, "POST", OVERPASS_BASE_URL, stream=True, content=overpass_query
+            )
+        except httpx.HTTPError as e:
+            logger.error("Final attempt failed: %s", e)
+            return None
         
-        restaurants = []
-        amenity_map = {
-            "restaurant": "Restaurant",
-            "cafe": "Café",
-            "pub": "Pub",
-            "fast_food": "Fast Food"
-        }
+        # Parse elements as the body arrives so the full document is never held in memory
+        places = []
+        elements = ijson.sendable_list()
+        parser = ijson.items_coro(elements, "elements.item", use_float=True)
+        try:
+            async for chunk in response.aiter_bytes():
+                parser.send(chunk)
+                places.extend(filter(None, map(_parse_element, elements)))
+                del elements[:]
+            parser.close()
+            places.extend(filter(None, map(_parse_element, elements)))
+        finally:
+            await response.aclose()
         
-        for element in data.get("elements", []):
-            if element.get("type") == "node":
-                lat = element.get("lat")
-                lon = element.get("lon")
-            elif element.get("type") in ["way", "relation"]:
-                center = element.get("center", {})
-                lat = center.get("lat")
-                lon = center.get("lon")
-            else:
-                continue
-            
-            if lat and lon:
-                tags = element.get("tags", {})
-                amenity_type = tags.get("amenity", "restaurant")
-                
-                restaurant = {
-                    "id": element.get("id"),
-                    "type": element.get("type"),
-                    "name": tags.get("name", f"Unnamed {amenity_map.get(amenity_type, 'Place')}"),
-                    "latitude": lat,
-                    "longitude": lon,
-                    "amenity": amenity_map.get(amenity_type, amenity_type),
-                    "cuisine": tags.get("cuisine", "Not specified"),
-                    "phone": tags.get("phone", "Not available"),
-                    "website": tags.get("website", tags.get("contact:website", "Not available")),
-                    "opening_hours": tags.get("opening_hours", "Not specified"),
-                }
-                restaurants.append(restaurant)
-        
-        # Sort by name and return limited results
-        restaurants = sorted(restaurants, key=lambda x: x.get("name", ""))[:limit]
-        logger.info(f"Found {len(restaurants)} places from Overpass API")
-        return restaurants
+        logger.debug("Parsed %d places from %d bytes on the wire", len(places), response.num_bytes_downloaded)
+        return places
     
-    except Exception as e:
-        logger.error(f"Error fetching restaurants: {e}")
-        import traceback
-        traceback.print_exc()
-        return []
+    except Exception:
+        logger.exception("Error fetching restaurants")
+        return None
 
 
+def _parse_element(element: dict[str, Any]) -> Restaurant | None:
+    """Convert an Overpass element into a Restaurant, or None if it has no position."""
+    element_type = element.get("type")
+    if element_type == "node":
+        lat = element.get("lat")
+        lon = element.get("lon")
+    elif element_type in _WAY_OR_RELATION:
+        center = element.get("center") or {}
+        lat = center.get("lat")
+        lon = center.get("lon")
+    else:
+        return None
+    
+    if lat is None or lon is None:
+        return None
+    tags = element.get("tags") or {}
+    amenity_type = tags.get("amenity", "restaurant")
+    name = tags.get("name", f"Unnamed {AMENITY_LABELS.get(amenity_type, 'Place')}")
+    cuisine = tags.get("cuisine", "Not specified")
+    return Restaurant(
+        id=element.get("id"),
+        type=element_type,
+        name=name,
+        latitude=lat,
+        longitude=lon,
+        amenity=AMENITY_LABELS.get(amenity_type, amenity_type),
+        cuisine=cuisine,
+        phone=tags.get("phone", "Not available"),
+        website=tags.get("website", tags.get("contact:website", "Not available")),
+        opening_hours=tags.get("opening_hours", "Not specified"),
+        point=_trig_point(lat, lon),
+        search_text=f"{name}\n{cuisine}".lower()
+    )
+
+
+def _format_restaurants(restaurants: list[Restaurant]) -> str:
+    """Render restaurants as a numbered plain-text list."""
+    return "".join(
+        f"{i}. {r.name}\n"
+        f"   Cuisine: {r.cuisine}\n"
+        f"   Coordinates: {r.latitude}, {r.longitude}\n"
+        f"   Distance: {r.distance_m} m\n"
+        f"   Phone: {r.phone}\n"
+        f"   Website: {r.website}\n"
+        f"   Hours: {r.opening_hours}\n\n"
+        for i, r in enumerate(restaurants, 1)
+    )
+
 
 @server.list_tools()
 async def list_tools() -> list[Tool]:
@@ -275,14 +624,7 @@ async def handle_tool_call(name: str, arguments: dict[str, Any]) -> list[TextCon
                 result = "No restaurants found in the specified area."
             else:
                 result = f"Found {len(restaurants)} restaurants:\n\n"
-                for i, restaurant in enumerate(restaurants, 1):
-                    result += f"{i}. {restaurant['name']}\n"
-                    result += f"   Cuisine: {restaurant['cuisine']}\n"
-                    result += f"   Coordinates: {restaurant['latitude']}, {restaurant['longitude']}\n"
-                    result += f"   Phone: {restaurant['phone']}\n"
-                    result += f"   Website: {restaurant['website']}\n"
-                    result += f"   Hours: {restaurant['opening_hours']}\n"
-                    result += f"   Rating: {restaurant['rating']}\n\n"
+                result += _format_restaurants(restaurants)
             
             return [TextContent(type="text", text=result)]
         
@@ -307,14 +649,7 @@ async def handle_tool_call(name: str, arguments: dict[str, Any]) -> list[TextCon
                 result = f"No restaurants found near {location.get('display_name', address)}."
             else:
                 result = f"Found {len(restaurants)} restaurants near {location.get('display_name', address)}:\n\n"
-                for i, restaurant in enumerate(restaurants, 1):
-                    result += f"{i}. {restaurant['name']}\n"
-                    result += f"   Cuisine: {restaurant['cuisine']}\n"
-                    result += f"   Coordinates: {restaurant['latitude']}, {restaurant['longitude']}\n"
-                    result += f"   Phone: {restaurant['phone']}\n"
-                    result += f"   Website: {restaurant['website']}\n"
-                    result += f"   Hours: {restaurant['opening_hours']}\n"
-                    result += f"   Rating: {restaurant['rating']}\n\n"
+                result += _format_restaurants(restaurants)
             
             return [TextContent(type="text", text=result)]
         
@@ -325,33 +660,19 @@ async def handle_tool_call(name: str, arguments: dict[str, Any]) -> list[TextCon
             
             # Use Nominatim reverse geocoding to get detailed info
             try:
-                async with httpx.AsyncClient() as client:
-                    response = await client.get(
-                        f"{NOMINATIM_BASE_URL}/reverse",
-                        params={
-                            "format": "json",
-                            "lat": latitude,
-                            "lon": longitude,
-                            "zoom": 18,
-                            "addressdetails": 1
-                        },
-                        timeout=10.0,
-                        headers={"User-Agent": "mcp-restaurant-finder"}
-                    )
-                    response.raise_for_status()
-                    data = response.json()
-                
-                address = data.get("address", {})
-                result = f"Restaurant: {name}\n"
-                result += f"Coordinates: {latitude}, {longitude}\n"
-                result += f"Address: {data.get('display_name', 'Not available')}\n"
-                result += f"City: {address.get('city', address.get('town', 'N/A'))}\n"
-                result += f"Country: {address.get('country', 'N/A')}\n"
-                
-                return [TextContent(type="text", text=result)]
-            except Exception as e:
-                logger.error(f"Error getting restaurant details: {e}")
+                data = await reverse_geocode(latitude, longitude)
+            except Exception:
+                logger.exception("Error getting restaurant details")
                 return [TextContent(type="text", text=f"Error retrieving details for {name}")]
+            
+            address = data.get("address", {})
+            result = f"Restaurant: {name}\n"
+            result += f"Coordinates: {latitude}, {longitude}\n"
+            result += f"Address: {data.get('display_name', 'Not available')}\n"
+            result += f"City: {address.get('city', address.get('town', 'N/A'))}\n"
+            result += f"Country: {address.get('country', 'N/A')}\n"
+            
+            return [TextContent(type="text", text=result)]
         
         elif name == "search_restaurants_by_query":
             query = arguments.get("query", "").lower()
@@ -359,41 +680,28 @@ async def handle_tool_call(name: str, arguments: dict[str, Any]) -> list[TextCon
             radius = arguments.get("radius", 1000)
             limit = arguments.get("limit", 10)
             
+            if query and _query_pattern(query) is None:
+                return [TextContent(type="text", text=f"Invalid query: {query!r} contains no search terms")]
+            
             # Geocode the address
             location = await geocode_address(address)
             if not location:
                 return [TextContent(type="text", text=f"Could not find coordinates for address: {address}")]
             
-            # Get all restaurants in the area
-            restaurants = await find_restaurants(
+            # Filter by query (cuisine or name) before picking the nearest matches
+            filtered = await find_restaurants(
                 location["latitude"],
                 location["longitude"],
                 radius,
-                limit * 2  # Fetch more to account for filtering
+                limit,
+                query=query
             )
             
-            # Filter by query (cuisine or name)
-            filtered = []
-            for restaurant in restaurants:
-                cuisine = restaurant.get("cuisine", "").lower()
-                name = restaurant.get("name", "").lower()
-                if query in cuisine or query in name:
-                    filtered.append(restaurant)
-            
-            # Limit results
-            filtered = filtered[:limit]
-            
             if not filtered:
                 result = f"No {query} restaurants found near {location.get('display_name', address)}."
             else:
                 result = f"Found {len(filtered)} {query} restaurants near {location.get('display_name', address)}:\n\n"
-                for i, restaurant in enumerate(filtered, 1):
-                    result += f"{i}. {restaurant['name']}\n"
-                    result += f"   Cuisine: {restaurant['cuisine']}\n"
-                    result += f"   Coordinates: {restaurant['latitude']}, {restaurant['longitude']}\n"
-                    result += f"   Phone: {restaurant['phone']}\n"
-                    result += f"   Website: {restaurant['website']}\n"
-                    result += f"   Hours: {restaurant['opening_hours']}\n\n"
+                result += _format_restaurants(filtered)
             
             return [TextContent(type="text", text=result)]
         
@@ -401,13 +709,17 @@ async def handle_tool_call(name: str, arguments: dict[str, Any]) -> list[TextCon
             return [TextContent(type="text", text=f"Unknown tool: {name}")]
     
     except Exception as e:
-        logger.error(f"Tool call error: {e}")
+        logger.exception("Tool call error")
         return [TextContent(type="text", text=f"Error: {str(e)}")]
 
 
 async def main():
     """Run the MCP server."""
-    await server.run_stdio()
+    try:
+        await server.run_stdio()
+    finally:
+        if _http_client is not None:
+            await _http_client.aclose()
 
 
 if __name__ == "__main__":
@@ -1,11 +1,44 @@
 import streamlit as st
 import asyncio
+import atexit
+import heapq
+import html
+import math
+import re
+import threading
 import httpx
+import ijson
+from operator import itemgetter
 from typing import Any
 
+try:
+    import uvloop
+except ImportError:  # optional, and not available on Windows
+    uvloop = None
+
 NOMINATIM_BASE_URL = "https://nominatim.openstreetmap.org"
 OVERPASS_BASE_URL = "https://overpass-api.de/api/interpreter"
 
+EARTH_RADIUS_M = 6371000
+METERS_PER_DEGREE = 111320
+# Searches are served from a cached superset fetched at the smallest bucket covering the radius
+RADIUS_BUCKETS = (500, 1000, 2000, 5000)
+# Centers are rounded to 3 decimals (~110 m), so fetch a little wider to still cover the true circle
+GRID_MARGIN_M = 100
+# Compact single-line query; the server-side timeout stops runaway queries early
+OVERPASS_QUERY_TEMPLATE = "[out:json][timeout:25][bbox:{bbox}];({statements});out center qt;"
+# Server-side aggregate only: a few hundred bytes however many places match
+OVERPASS_COUNT_TEMPLATE = '[out:json][timeout:25];nwr["amenity"="restaurant"](around:{radius},{lat:.6f},{lon:.6f});out count;'
+
+POPULAR_CUISINES = ["Indian", "Italian", "Chinese", "Mexican", "Thai", "Japanese"]
+# Element types whose position comes from the "center" added by `out center`
+_WAY_OR_RELATION = frozenset(("way", "relation"))
+
+DEFAULT_REC_LOCATION = "Delhi"
+REC_RADIUS = 2000
+# One alternation finds every popular cuisine a place mentions in a single scan of its text
+POPULAR_CUISINE_PATTERN = re.compile("|".join(c.lower() for c in POPULAR_CUISINES))
+
 # Page configuration
 st.set_page_config(
     page_title="Restaurant Finder",
@@ -15,8 +48,7 @@ st.set_page_config(
 )
 
 # Custom CSS
-st.markdown("""
-<style>
+PAGE_CSS = """
     * {
         margin: 0;
         padding: 0;
@@ -160,108 +192,427 @@ st.markdown("""
     .icon {
         font-size: 32px;
     }
-</style>
-""", unsafe_allow_html=True)
+"""
+
+
+@st.cache_resource
+def _page_style() -> str:
+    """Whitespace-collapsed <style> block, built once per process"""
+    return f"<style>{' '.join(PAGE_CSS.split())}</style>"
+
+
+def _inject_css():
+    # Must be sent on every full rerun, or Streamlit drops the element and the styles with it
+    st.markdown(_page_style(), unsafe_allow_html=True)
+
+
+@st.cache_resource
+def _event_loop() -> asyncio.AbstractEventLoop:
+    """Long-lived event loop on a daemon thread, shared by all reruns so pooled connections stay usable"""
+    loop = uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="async-loop", daemon=True).start()
+    return loop
+
+
+@st.cache_resource
+def get_client() -> httpx.AsyncClient:
+    """Shared HTTP client with keep-alive connection pooling"""
+    client = httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        timeout=30.0,
+        # Brotli decoding comes from the httpx[brotli] extra
+        headers={"User-Agent": "streamlit-restaurant-finder", "Accept-Encoding": "gzip, br, deflate"},
+    )
+    atexit.register(lambda: run_async(client.aclose()))
+    return client
 
 
-async def geocode_address(address: str) -> dict[str, Any]:
+async def geocode_address(client: httpx.AsyncClient, address: str) -> dict[str, Any]:
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{NOMINATIM_BASE_URL}/search",
-                params={"q": address, "format": "json", "limit": 1},
-                timeout=10.0,
-                headers={"User-Agent": "streamlit-restaurant-finder"},
-            )
-            response.raise_for_status()
-            data = response.json()
-            if data:
-                r = data[0]
-                return {"latitude": float(r["lat"]), "longitude": float(r["lon"]), "display_name": r.get("display_name", "")}
-            return {}
+        response = await client.get(
+            f"{NOMINATIM_BASE_URL}/search",
+            params={"q": address, "format": "json", "limit": 1},
+            timeout=10.0,
+        )
+        response.raise_for_status()
+        data = response.json()
+        if data:
+            r = data[0]
+            return {"latitude": float(r["lat"]), "longitude": float(r["lon"]), "display_name": r.get("display_name", "")}
+        return {}
     except Exception as e:
         return {"error": str(e)}
 
 
-async def find_restaurants(latitude: float, longitude: float, radius: int = 1000, limit: int = 10):
-    lat_radius = radius / 111000
-    lon_radius = lat_radius
-    bbox = f"{latitude - lat_radius},{longitude - lon_radius},{latitude + lat_radius},{longitude + lon_radius}"
+def _distance_from(latitude: float, longitude: float):
+    """Haversine distance in metres from a fixed origin, with the origin's trig computed once"""
+    phi0 = math.radians(latitude)
+    cos_phi0 = math.cos(phi0)
+
+    def distance_m(place: dict[str, Any]) -> float:
+        phi = math.radians(place["latitude"])
+        a = math.sin((phi - phi0) / 2) ** 2 + cos_phi0 * math.cos(phi) * math.sin(math.radians(place["longitude"] - longitude) / 2) ** 2
+        return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
+
+    return distance_m
+
+
+def _overpass_regex(text: str) -> str:
+    """Escape text as a literal Overpass (POSIX ERE) pattern inside a double-quoted string"""
+    pattern = re.sub(r"([.^$*+?()\[\]{}|\\])", r"\\\1", text)
+    return pattern.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def _bbox(latitude: float, longitude: float, radius: int) -> str:
+    # Degrees of longitude shrink with cos(latitude), so widen the east-west span to match
+    lat_radius = radius / METERS_PER_DEGREE
+    lon_radius = radius / (METERS_PER_DEGREE * max(math.cos(math.radians(latitude)), 1e-6))
+    return f"{latitude - lat_radius:.6f},{longitude - lon_radius:.6f},{latitude + lat_radius:.6f},{longitude + lon_radius:.6f}"
+
+
+async def count_restaurants(client: httpx.AsyncClient, latitude: float, longitude: float, radius: int) -> int:
+    response = await client.post(OVERPASS_BASE_URL, content=OVERPASS_COUNT_TEMPLATE.format(radius=radius, lat=latitude, lon=longitude))
+    response.raise_for_status()
+    return int(response.json()["elements"][0]["tags"]["total"])
+
+
+async def fetch_overpass(client: httpx.AsyncClient, latitude: float, longitude: float, radius: int, cuisine: str = "") -> list[dict[str, Any]]:
+    bbox = _bbox(latitude, longitude, radius)
+
+    # Match the cuisine text against either the cuisine or the name tag, like the UI filter does
+    if cuisine:
+        pattern = _overpass_regex(cuisine)
+        filters = [f'["cuisine"~"{pattern}",i]', f'["name"~"{pattern}",i]']
+    else:
+        filters = [""]
+    statements = "".join(f'nwr["amenity"="restaurant"]{f};' for f in filters)
+    overpass_query = OVERPASS_QUERY_TEMPLATE.format(bbox=bbox, statements=statements)
 
-    overpass_query = f"""
-    [bbox:{bbox}][out:json];
-    (
-        node["amenity"="restaurant"];
-        way["amenity"="restaurant"];
-        relation["amenity"="restaurant"];
-    );
-    out center;
-    """
+    # Parse elements as the body arrives instead of materializing the whole document first
+    restaurants = []
+    elements = ijson.sendable_list()
+    parser = ijson.items_coro(elements, "elements.item", use_float=True)
+    async with client.stream("POST", OVERPASS_BASE_URL, content=overpass_query) as response:
+        response.raise_for_status()
+        async for chunk in response.aiter_bytes():
+            parser.send(chunk)
+            restaurants.extend(filter(None, map(_parse_element, elements)))
+            del elements[:]
+    parser.close()
+    restaurants.extend(filter(None, map(_parse_element, elements)))
 
+    return restaurants
+
+
+def _parse_element(element: dict[str, Any]) -> dict[str, Any] | None:
+    element_type = element.get("type")
+    if element_type == "node":
+        lat = element.get("lat")
+        lon = element.get("lon")
+    elif element_type in _WAY_OR_RELATION:
+        center = element.get("center") or {}
+        lat = center.get("lat")
+        lon = center.get("lon")
+    else:
+        return None
+
+    if lat is not None and lon is not None:
+        tags = element.get("tags") or {}
+        name = tags.get("name")
+        cuisine = tags.get("cuisine", "Not specified")
+        return {
+            "id": element.get("id"),
+            "name": name or "Unknown Restaurant",
+            "latitude": lat,
+            "longitude": lon,
+            "cuisine": cuisine,
+            "phone": tags.get("phone", "Not available"),
+            "website": tags.get("website", tags.get("contact:website", "Not available")),
+            "opening_hours": tags.get("opening_hours", "Not specified"),
+            # Lower-cased once here (and cached with the results) for client-side matching
+            "_search_blob": f"{name or ''}\n{cuisine}".lower(),
+        }
+    return None
+
+
+def bucket_by_cuisine(restaurants: list[dict[str, Any]]) -> dict[str, list[dict[str, Any]]]:
+    """Group places under each popular cuisine their name or cuisine tag mentions"""
+    buckets = {c: [] for c in POPULAR_CUISINES}
+    for r in restaurants:
+        for match in {m.group() for m in POPULAR_CUISINE_PATTERN.finditer(r["_search_blob"])}:
+            buckets[match.title()].append(r)
+    return buckets
+
+
+@st.cache_data(ttl=3600, max_entries=128, show_spinner=False)
+def _cached_overpass(lat_q: float, lon_q: float, radius_q: int, cuisine: str, _client: httpx.AsyncClient) -> list[dict[str, Any]]:
+    return run_async(fetch_overpass(_client, lat_q, lon_q, radius_q + GRID_MARGIN_M, cuisine))
+
+
+@st.cache_data(ttl=3600, max_entries=128, show_spinner=False)
+def _cached_count(latitude: float, longitude: float, radius: int, _client: httpx.AsyncClient) -> int:
+    return run_async(count_restaurants(_client, latitude, longitude, radius))
+
+
+def widen_radius_hint(client: httpx.AsyncClient, loc: dict[str, Any], radius: int) -> str | None:
+    """Suggest a larger radius when a count-only probe finds places beyond the current one"""
+    wider = RADIUS_BUCKETS[-1]
+    if radius >= wider:
+        return None
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(OVERPASS_BASE_URL, data=overpass_query, timeout=30.0, headers={"User-Agent": "streamlit-restaurant-finder"})
-            response.raise_for_status()
-            data = response.json()
-
-        restaurants = []
-        for element in data.get("elements", [])[:limit]:
-            if element.get("type") == "node":
-                lat = element.get("lat")
-                lon = element.get("lon")
-            elif element.get("type") in ["way", "relation"]:
-                center = element.get("center", {})
-                lat = center.get("lat")
-                lon = center.get("lon")
-            else:
-                continue
-
-            if lat and lon:
-                tags = element.get("tags", {})
-                restaurants.append({
-                    "id": element.get("id"),
-                    "name": tags.get("name", "Unknown Restaurant"),
-                    "latitude": lat,
-                    "longitude": lon,
-                    "cuisine": tags.get("cuisine", "Not specified"),
-                    "phone": tags.get("phone", "Not available"),
-                    "website": tags.get("website", tags.get("contact:website", "Not available")),
-                    "opening_hours": tags.get("opening_hours", "Not specified"),
-                })
-
-        return restaurants
+        count = _cached_count(loc["latitude"], loc["longitude"], wider, client)
+    except Exception:
+        return None
+    if not count:
+        return None
+    return f"About {count} places are within {wider // 1000} km. Try increasing the search radius."
+
+
+def find_restaurants(client: httpx.AsyncClient, latitude: float, longitude: float, radius: int = 1000, limit: int = 10, cuisine: str | None = None):
+    """Find the nearest places within radius, optionally matching cuisine or name, reusing cached Overpass results for nearby searches"""
+    radius_q = next((b for b in RADIUS_BUCKETS if b >= radius), radius)
+    cuisine = cuisine.strip().lower() if cuisine else ""
+    try:
+        places = _cached_overpass(round(latitude, 3), round(longitude, 3), radius_q, cuisine, client)
     except Exception as e:
         return [{"error": str(e)}]
 
+    # Nearest first rather than Overpass's arbitrary output order
+    distance_m = _distance_from(latitude, longitude)
+    nearby = [(d, r) for r in places if (d := distance_m(r)) <= radius]
+    return [r for _, r in heapq.nsmallest(limit, nearby, key=itemgetter(0))]
+
 
 def run_async(coro):
-    return asyncio.run(coro)
+    return asyncio.run_coroutine_threadsafe(coro, _event_loop()).result()
+
+
+@st.cache_data(ttl=86400, max_entries=512, show_spinner=False)
+def _cached_geocode(address: str, _client: httpx.AsyncClient) -> dict[str, Any]:
+    loc = run_async(geocode_address(_client, address))
+    if "error" in loc:
+        # Raising keeps transient failures out of the cache
+        raise RuntimeError(loc["error"])
+    return loc
+
+
+def geocode(client: httpx.AsyncClient, address: str) -> dict[str, Any]:
+    """Geocode an address, reusing results for repeated queries"""
+    try:
+        return _cached_geocode(address.strip().lower(), client)
+    except RuntimeError as e:
+        return {"error": str(e) or "Geocoding failed"}
+
+
+def clear_geocode_cache():
+    _cached_geocode.clear()
+
+
+def locate_and_find(client: httpx.AsyncClient, address: str, radius: int, limit: int, cuisine: str | None = None):
+    """Geocode an address and search around it"""
+    loc = geocode(client, address)
+    if not loc or loc.get("error"):
+        return loc, []
+    return loc, find_restaurants(client, loc["latitude"], loc["longitude"], radius=radius, limit=limit, cuisine=cuisine)
+
+
+def _prefetch_recommendations(client: httpx.AsyncClient, selected: str):
+    """Warm the caches for the default recommendation location and every popular cuisine, selected one first"""
+    # Sequential on purpose: Overpass only grants a couple of concurrent slots per client
+    for cuisine in [selected] + [c for c in POPULAR_CUISINES if c != selected]:
+        loc, _ = locate_and_find(client, DEFAULT_REC_LOCATION, REC_RADIUS, 30, cuisine=cuisine)
+        if not loc or loc.get("error"):
+            return
 
 
 def display_restaurant_card(restaurant):
-    """Display a single restaurant as a card"""
-    col1, col2 = st.columns([1, 3])
+    """Display a single restaurant as a card, sent to the browser as one element"""
+    esc = html.escape
+    amenity = restaurant.get('amenity', 'Restaurant')
+    emoji = {'Restaurant': '🍽️', 'Café': '☕', 'Pub': '🍺', 'Fast Food': '🍔'}.get(amenity, '🍽️')
+    website = restaurant.get('website')
+    # Only http(s) values become links; anything else (e.g. "www.example.com") is shown as plain text
+    if website and website.startswith(("http://", "https://")):
+        website_html = f'<b>Website:</b> <a href="{esc(website)}" target="_blank">{esc(website)}</a><br>'
+    elif website and website != 'Not available':
+        website_html = f'<b>Website:</b> {esc(website)}<br>'
+    else:
+        website_html = ""
+    st.markdown(
+        f'<div class="restaurant-card">'
+        f'<div class="restaurant-name"><span class="icon">{emoji}</span> {esc(restaurant.get("name", "Unknown"))}</div>'
+        f'<div class="restaurant-info">'
+        f'<b>Type:</b> {esc(amenity)}<br>'
+        f'<b>Cuisine:</b> {esc(restaurant.get("cuisine", "Not specified"))}<br>'
+        f'<b>Phone:</b> {esc(restaurant.get("phone", "Not available"))}<br>'
+        f'<b>Lat/Lon:</b> {restaurant.get("latitude"):.4f}, {restaurant.get("longitude"):.4f}<br>'
+        f'{website_html}'
+        f'<b>Hours:</b> {esc(restaurant.get("opening_hours", "Not specified"))}'
+        f'</div></div>',
+        unsafe_allow_html=True,
+    )
+
+
+
+@st.fragment
+def find_nearby_tab(client: httpx.AsyncClient):
+    """Find Nearby tab, rerun on its own when its widgets change"""
+    st.markdown("### Find Nearby Restaurants")
+
+    col1, col2 = st.columns(2)
+
     with col1:
-        amenity = restaurant.get('amenity', 'Restaurant')
-        emoji = {'Restaurant': '🍽️', 'Café': '☕', 'Pub': '🍺', 'Fast Food': '🍔'}.get(amenity, '🍽️')
-        st.markdown(emoji, unsafe_allow_html=True)
+        location = st.text_input("Location", value="Hitech City Hyderabad", key="location_input")
+
     with col2:
-        st.markdown(f"### {restaurant.get('name', 'Unknown')}")
-        col_a, col_b = st.columns(2)
-        with col_a:
-            st.markdown(f"**Type:** {restaurant.get('amenity', 'Restaurant')}")
-            st.markdown(f"**Cuisine:** {restaurant.get('cuisine', 'Not specified')}")
-            st.markdown(f"**Phone:** {restaurant.get('phone', 'Not available')}")
-        with col_b:
-            st.markdown(f"**Lat/Lon:** {restaurant.get('latitude'):.4f}, {restaurant.get('longitude'):.4f}")
-            if restaurant.get('website') and restaurant.get('website') != 'Not available':
-                st.markdown(f"**Website:** [{restaurant.get('website')}]({restaurant.get('website')})")
-            st.markdown(f"**Hours:** {restaurant.get('opening_hours', 'Not specified')}")
-    st.divider()
+        cuisine = st.text_input("Cuisine Type (optional)", value="Indian Andhra style", key="cuisine_input")
+
+    radius = st.slider("Search Radius (meters)", 500, 5000, 1000)
 
+    col_search, col_empty = st.columns([1, 3])
+    with col_search:
+        search_btn = st.button("🔍 Find Restaurants", use_container_width=True)
+
+    if search_btn:
+        with st.spinner("🔍 Geocoding location..."):
+            loc = geocode(client, location)
+
+        if not loc or loc.get("error"):
+            st.session_state.pop("nearby_results", None)
+            st.error(f"❌ Could not find location: {location}")
+            return
+
+        with st.spinner("🔍 Searching for nearby places..."):
+            # Cuisine filtering happens in the Overpass query; fall back to everything nearby only when it finds nothing
+            filtered = find_restaurants(client, loc["latitude"], loc["longitude"], radius=radius, limit=30, cuisine=cuisine)
+            if cuisine.strip() and not filtered:
+                restaurants = find_restaurants(client, loc["latitude"], loc["longitude"], radius=radius, limit=30)
+            else:
+                restaurants = filtered
+            error = restaurants[0]["error"] if restaurants and restaurants[0].get("error") else None
+            # Only probe a wider radius when the search worked and the area is genuinely empty
+            hint = widen_radius_hint(client, loc, radius) if not restaurants else None
+
+        if error:
+            filtered = restaurants = []
+        st.session_state.nearby_results = (loc, cuisine, filtered, restaurants, hint, error)
+
+    # Results stay on screen across reruns of this tab; editing the cuisine or radius takes effect on the next search
+    if "nearby_results" not in st.session_state:
+        return
+    loc, searched_cuisine, filtered, restaurants, hint, error = st.session_state.nearby_results
+
+    st.success(f"✅ Found location: {loc.get('display_name', location)}")
+
+    if restaurants:
+        if filtered:
+            st.markdown(f"### 🎯 Found {len(filtered)} Places")
+            for r in filtered[:15]:
+                display_restaurant_card(r)
+        else:
+            st.info(f"No {searched_cuisine} places found. Showing all available places:")
+            for r in restaurants[:15]:
+                display_restaurant_card(r)
+    elif error:
+        st.error(f"❌ Could not search for places right now: {error}")
+    else:
+        st.info("❌ No places found in this area. This location may have limited data in OpenStreetMap. Try a different location or increase the search radius.")
+        if hint:
+            st.caption(hint)
+
+
+@st.fragment
+def search_tab(client: httpx.AsyncClient):
+    """Search tab, rerun on its own when its widgets change"""
+    st.markdown("### Search by Cuisine")
+
+    search_query = st.text_input("Cuisine or restaurant type (e.g., italian, pizza, burger)", value="italian")
+    search_location = st.text_input("Location", value="Mumbai")
+    search_radius = st.slider("Search Radius (meters)", 500, 5000, 1000, key="search_radius")
+
+    if st.button("🔎 Search", use_container_width=True):
+        with st.spinner(f"🔍 Searching for {search_query} places..."):
+            loc, filtered = locate_and_find(client, search_location, search_radius, 30, cuisine=search_query)
+            if loc and not loc.get("error") and not filtered:
+                restaurants = find_restaurants(client, loc["latitude"], loc["longitude"], radius=search_radius, limit=30)
+            else:
+                restaurants = filtered
+
+        if not loc or loc.get("error"):
+            st.error(f"❌ Could not find location: {search_location}")
+            return
+
+        if restaurants and not restaurants[0].get("error"):
+            if filtered:
+                st.markdown(f"### 🎯 Found {len(filtered)} {search_query.title()} Places")
+                for r in filtered[:15]:
+                    display_restaurant_card(r)
+            else:
+                st.info(f"No {search_query} places found in {search_location}. Showing all available places:")
+                for r in restaurants[:10]:
+                    display_restaurant_card(r)
+        elif restaurants:
+            st.error(f"❌ Could not search for places right now: {restaurants[0]['error']}")
+        else:
+            st.info(f"No places found in {search_location}. The area may have limited data in OpenStreetMap.")
+            hint = widen_radius_hint(client, loc, search_radius)
+            if hint:
+                st.caption(hint)
+
+
+@st.fragment
+def recommendations_tab(client: httpx.AsyncClient):
+    """Recommendations tab, rerun on its own when its widgets change"""
+    st.markdown("### Popular Cuisines")
+
+    col1, col2, col3 = st.columns(3)
+
+    # Show popular cuisine buttons
+    for i, cuisine_type in enumerate(POPULAR_CUISINES):
+        col = [col1, col2, col3][i % 3]
+        with col:
+            if st.button(f"🍲 {cuisine_type}", key=f"cuisine_{cuisine_type}", use_container_width=True):
+                st.session_state.selected_cuisine = cuisine_type
+                # Once the tab is actually used, warm the caches for the other cuisines at the default location
+                if "recommendations_prefetched" not in st.session_state:
+                    st.session_state.recommendations_prefetched = True
+                    threading.Thread(target=_prefetch_recommendations, args=(client, cuisine_type), name="prefetch", daemon=True).start()
+
+    if "selected_cuisine" in st.session_state:
+        rec_location = st.text_input("Enter location for recommendations", value=DEFAULT_REC_LOCATION)
+        if st.button("Get Recommendations"):
+            with st.spinner(f"🔍 Finding {st.session_state.selected_cuisine} places..."):
+                loc, filtered = locate_and_find(client, rec_location, REC_RADIUS, 30, cuisine=st.session_state.selected_cuisine)
+                if loc and not loc.get("error"):
+                    restaurants = filtered or find_restaurants(client, loc["latitude"], loc["longitude"], radius=REC_RADIUS, limit=30)
+                    if restaurants and not restaurants[0].get("error"):
+                        if filtered:
+                            st.markdown(f"### ⭐ Best {st.session_state.selected_cuisine} Places in {rec_location}")
+                            for r in filtered[:10]:
+                                display_restaurant_card(r)
+                        else:
+                            st.info(f"No specific {st.session_state.selected_cuisine} places found. Showing all available places in {rec_location}:")
+                            nearby = [f"{c} ({len(rs)})" for c, rs in bucket_by_cuisine(restaurants).items() if rs]
+                            if nearby:
+                                st.caption(f"Popular cuisines nearby: {', '.join(nearby)}")
+                            for r in restaurants[:10]:
+                                display_restaurant_card(r)
+                    else:
+                        st.info(f"No places found in {rec_location}. The area may have limited OpenStreetMap data.")
+                else:
+                    st.error(f"Could not find location: {rec_location}")
 
 
 def main():
+    _inject_css()
+    client = get_client()
+
+    with st.sidebar:
+        if st.button("🗑️ Clear location cache", use_container_width=True):
+            clear_geocode_cache()
+            st.toast("Location cache cleared")
+
     # Header
     st.markdown("""
     <div style="display: flex; align-items: center; gap: 15px; margin-bottom: 10px;">
@@ -276,120 +627,13 @@ def main():
     tab1, tab2, tab3 = st.tabs(["🔍 Find Nearby", "🔎 Search", "⭐ Recommendations"])
     
     with tab1:
-        st.markdown("### Find Nearby Restaurants")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            location = st.text_input("Location", value="Hitech City Hyderabad", key="location_input")
-        
-        with col2:
-            cuisine = st.text_input("Cuisine Type (optional)", value="Indian Andhra style", key="cuisine_input")
-        
-        radius = st.slider("Search Radius (meters)", 500, 5000, 1000)
-        
-        col_search, col_empty = st.columns([1, 3])
-        with col_search:
-            search_btn = st.button("🔍 Find Restaurants", use_container_width=True)
-        
-        if search_btn:
-            with st.spinner("🔍 Geocoding location..."):
-                loc = run_async(geocode_address(location))
-            
-            if not loc or loc.get("error"):
-                st.error(f"❌ Could not find location: {location}")
-                return
-            
-            st.success(f"✅ Found location: {loc.get('display_name', location)}")
-            
-            with st.spinner("🔍 Searching for nearby places..."):
-                restaurants = run_async(find_restaurants(loc["latitude"], loc["longitude"], radius=radius, limit=30))
-            
-            if restaurants:
-                # Filter by cuisine if provided
-                if cuisine and cuisine.strip():
-                    filtered = [r for r in restaurants if cuisine.lower() in r.get("cuisine", "").lower() or cuisine.lower() in r.get("name", "").lower()]
-                else:
-                    filtered = restaurants
-                
-                if filtered:
-                    st.markdown(f"### 🎯 Found {len(filtered)} Places")
-                    for r in filtered[:15]:
-                        display_restaurant_card(r)
-                else:
-                    st.info(f"No {cuisine} places found. Showing all available places:")
-                    for r in restaurants[:15]:
-                        display_restaurant_card(r)
-            else:
-                st.info("❌ No places found in this area. This location may have limited data in OpenStreetMap. Try a different location or increase the search radius.")
+        find_nearby_tab(client)
     
     with tab2:
-        st.markdown("### Search by Cuisine")
-        
-        search_query = st.text_input("Cuisine or restaurant type (e.g., italian, pizza, burger)", value="italian")
-        search_location = st.text_input("Location", value="Mumbai")
-        search_radius = st.slider("Search Radius (meters)", 500, 5000, 1000, key="search_radius")
-        
-        if st.button("🔎 Search", use_container_width=True):
-            with st.spinner("🔍 Geocoding location..."):
-                loc = run_async(geocode_address(search_location))
-            
-            if not loc or loc.get("error"):
-                st.error(f"❌ Could not find location: {search_location}")
-                return
-            
-            with st.spinner(f"🔍 Searching for {search_query} places..."):
-                restaurants = run_async(find_restaurants(loc["latitude"], loc["longitude"], radius=search_radius, limit=30))
-            
-            if restaurants and not restaurants[0].get("error"):
-                filtered = [r for r in restaurants if search_query.lower() in r.get("cuisine", "").lower() or search_query.lower() in r.get("name", "").lower()]
-                
-                if filtered:
-                    st.markdown(f"### 🎯 Found {len(filtered)} {search_query.title()} Places")
-                    for r in filtered[:15]:
-                        display_restaurant_card(r)
-                else:
-                    st.info(f"No {search_query} places found in {search_location}. Showing all available places:")
-                    for r in restaurants[:10]:
-                        display_restaurant_card(r)
-            else:
-                st.info(f"No places found in {search_location}. The area may have limited data in OpenStreetMap.")
+        search_tab(client)
     
     with tab3:
-        st.markdown("### Popular Cuisines")
-        
-        col1, col2, col3 = st.columns(3)
-        
-        popular = ["Indian", "Italian", "Chinese", "Mexican", "Thai", "Japanese"]
-        
-        # Show popular cuisine buttons
-        for i, cuisine_type in enumerate(popular):
-            col = [col1, col2, col3][i % 3]
-            with col:
-                if st.button(f"🍲 {cuisine_type}", key=f"cuisine_{cuisine_type}", use_container_width=True):
-                    st.session_state.selected_cuisine = cuisine_type
-        
-        if "selected_cuisine" in st.session_state:
-            rec_location = st.text_input("Enter location for recommendations", value="Delhi")
-            if st.button("Get Recommendations"):
-                with st.spinner(f"🔍 Finding {st.session_state.selected_cuisine} places..."):
-                    loc = run_async(geocode_address(rec_location))
-                    if loc and not loc.get("error"):
-                        restaurants = run_async(find_restaurants(loc["latitude"], loc["longitude"], radius=2000, limit=30))
-                        if restaurants:
-                            filtered = [r for r in restaurants if st.session_state.selected_cuisine.lower() in r.get("cuisine", "").lower()]
-                            if filtered:
-                                st.markdown(f"### ⭐ Best {st.session_state.selected_cuisine} Places in {rec_location}")
-                                for r in filtered[:10]:
-                                    display_restaurant_card(r)
-                            else:
-                                st.info(f"No specific {st.session_state.selected_cuisine} places found. Showing all available places in {rec_location}:")
-                                for r in restaurants[:10]:
-                                    display_restaurant_card(r)
-                        else:
-                            st.info(f"No places found in {rec_location}. The area may have limited OpenStreetMap data.")
-                    else:
-                        st.error(f"Could not find location: {rec_location}")
+        recommendations_tab(client)
 
 if __name__ == "__main__":
     main()